@@ -65,12 +65,12 @@ def status_cmd(args):
         print(f"Submitted at: {submitted}")
 
     print(f"\nState: {snapshot['state']}")
-    print(f"Outreach: {metrics['total_outreach_count']}")
-    print(f"Follow-ups: {metrics['follow_up_count']}")
+    print(f"Outreach: {metrics.total_outreach_count}")
+    print(f"Follow-ups: {metrics.follow_up_count}")
 
     print(
-        f"Customization: resume {'✓' if metrics['resume_customized'] else '✗'} | "
-        f"cover letter {'✓' if metrics['cover_letter_customized'] else '✗'}"
+        f"Customization: resume {'✓' if metrics.resume_customized else '✗'} | "
+        f"cover letter {'✓' if metrics.cover_letter_customized else '✗'}"
     )
 
     print("\nInsights:")
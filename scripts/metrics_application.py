@@ -1,13 +1,84 @@
-import sqlite3
-from pathlib import Path
 from datetime import datetime, timezone
 
-# Database path
-DB_PATH = Path(__file__).resolve().parents[1] / "data" / "asa.db"
+from scripts.score_applications import (
+    SQL_CURRENT_STATUS,
+    SQL_FOLLOW_UP_COUNT,
+    SQL_STATUS_CHANGE_COUNT,
+    SQL_TOTAL_OUTREACH,
+    get_connection,
+    has_follow_up,
+    read_transaction,
+)
 
 
-def get_connection():
-    return sqlite3.connect(DB_PATH)
+# -------------------------
+# Query templates
+# -------------------------
+
+# Module-level so repeated calls reuse the connection's cached statements.
+# Lookups shared with score_applications are imported from there; only
+# queries whose rules differ in this module are defined here.
+SQL_OUTREACH_COUNTS = """
+    SELECT
+        COUNT(*),
+        COALESCE(SUM(CASE WHEN outreach_type = 'follow_up' THEN 1 ELSE 0 END), 0)
+    FROM outreach_events
+    WHERE application_id = ?
+"""
+
+# One indexed lookup per table; ?1 binds the same id to each.
+# Day arithmetic runs in SQLite, so no timestamps are parsed in Python.
+SQL_DAYS_SINCE_LAST_ACTION = """
+    SELECT CAST(
+        julianday(?2) - NULLIF(MAX(
+            COALESCE(julianday((SELECT MAX(timestamp) FROM status_history WHERE application_id = ?1)), 0),
+            COALESCE(julianday((SELECT MAX(timestamp) FROM outreach_events WHERE application_id = ?1)), 0),
+            COALESCE(julianday((SELECT created_at FROM applications WHERE application_id = ?1)), 0)
+        ), 0)
+    AS INTEGER)
+"""
+
+# Whole-table aggregates for application_metrics_view, one row per
+# application. Each reports days since its latest event as a fraction;
+# the view keeps the smallest.
+SQL_APPLICATION_CREATED = """
+    SELECT application_id, julianday(:now) - julianday(created_at)
+    FROM applications
+"""
+
+SQL_OUTREACH_BY_APPLICATION = """
+    SELECT
+        application_id,
+        COUNT(*),
+        SUM(CASE WHEN outreach_type = 'follow_up' THEN 1 ELSE 0 END),
+        julianday(:now) - julianday(MAX(timestamp))
+    FROM outreach_events
+    GROUP BY application_id
+"""
+
+SQL_STATUS_BY_APPLICATION = """
+    SELECT
+        application_id,
+        COUNT(*),
+        julianday(:now) - julianday(MAX(timestamp))
+    FROM status_history
+    GROUP BY application_id
+"""
+
+SQL_LATEST_STATUS_BY_APPLICATION = """
+    SELECT application_id, status
+    FROM (
+        SELECT
+            application_id,
+            status,
+            ROW_NUMBER() OVER (
+                PARTITION BY application_id
+                ORDER BY timestamp DESC, status_id DESC
+            ) AS rn
+        FROM status_history
+    )
+    WHERE rn = 1
+"""
 
 
 # -------------------------
@@ -16,125 +87,47 @@ def get_connection():
 
 def total_outreach_count(application_id):
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT COUNT(*)
-        FROM outreach_events
-        WHERE application_id = ?
-        """,
-        (application_id,)
-    )
-
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    return conn.execute(SQL_TOTAL_OUTREACH, (application_id,)).fetchone()[0]
 
 
 def follow_up_count(application_id):
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT COUNT(*)
-        FROM outreach_events
-        WHERE application_id = ?
-          AND outreach_type = 'follow_up'
-        """,
-        (application_id,)
-    )
+    return conn.execute(SQL_FOLLOW_UP_COUNT, (application_id,)).fetchone()[0]
 
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
 
-
-def total_action_count(application_id):
+def outreach_counts(application_id):
+    # (total outreach, follow-ups) from a single scan of the application's events
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT COUNT(*) FROM status_history
-        WHERE application_id = ?
-        """,
-        (application_id,)
-    )
-    status_count = cursor.fetchone()[0]
-
-    cursor.execute(
-        """
-        SELECT COUNT(*) FROM outreach_events
-        WHERE application_id = ?
-        """,
-        (application_id,)
-    )
-    outreach_count = cursor.fetchone()[0]
+    return conn.execute(SQL_OUTREACH_COUNTS, (application_id,)).fetchone()
 
-    conn.close()
-    return status_count + outreach_count
+
+def status_change_count(application_id):
+    conn = get_connection()
+    return conn.execute(SQL_STATUS_CHANGE_COUNT, (application_id,)).fetchone()[0]
 
 
-def has_follow_up(application_id):
-    return follow_up_count(application_id) >= 1
+def total_action_count(application_id):
+    return status_change_count(application_id) + total_outreach_count(application_id)
 
 
 def effort_score_raw(application_id):
     # v1.1 definition: simple count of actions
     return total_action_count(application_id)
 
-def days_since_last_action(application_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT MAX(ts) FROM (
-            SELECT timestamp AS ts FROM status_history WHERE application_id = ?
-            UNION ALL
-            SELECT timestamp AS ts FROM outreach_events WHERE application_id = ?
-            UNION ALL
-            SELECT created_at AS ts FROM applications WHERE application_id = ?
-        )
-        """,
-        (application_id, application_id, application_id)
-    )
-
-    result = cursor.fetchone()[0]
-    conn.close()
-
-    if result is None:
-        return None
-
-    last_action_time = datetime.fromisoformat(result)
-    now = datetime.now(timezone.utc)
-
-    # ensure both are timezone-aware
-    if last_action_time.tzinfo is None:
-        last_action_time = last_action_time.replace(tzinfo=timezone.utc)
+def days_since_last_action(application_id, now=None):
+    # Callers looping over applications pass a single `now`
+    if now is None:
+        now = datetime.now(timezone.utc)
 
-    return (now - last_action_time).days
+    conn = get_connection()
+    return conn.execute(
+        SQL_DAYS_SINCE_LAST_ACTION, (application_id, now.isoformat())
+    ).fetchone()[0]
 
 
 def current_status(application_id):
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT status
-        FROM status_history
-        WHERE application_id = ?
-        ORDER BY timestamp DESC
-        LIMIT 1
-        """,
-        (application_id,)
-    )
-
-    row = cursor.fetchone()
-    conn.close()
+    row = conn.execute(SQL_CURRENT_STATUS, (application_id,)).fetchone()
 
     if row is None:
         return None
@@ -148,32 +141,48 @@ def current_status(application_id):
 def application_metrics_view():
     """
     Returns one row per application with core behavioral metrics.
+    Four grouped queries, merged by application_id, replace the
+    per-application helper calls. Rows keep this module's
+    definitions: current_status is None without status history,
+    and total_action_count excludes responses.
     """
     conn = get_connection()
-    cursor = conn.cursor()
+    params = {"now": datetime.now(timezone.utc).isoformat()}
+
+    # The grouped reads share one snapshot
+    with read_transaction(conn):
+        created = conn.execute(SQL_APPLICATION_CREATED, params).fetchall()
+        outreach = {
+            app_id: (total, follow_ups, idle)
+            for app_id, total, follow_ups, idle
+            in conn.execute(SQL_OUTREACH_BY_APPLICATION, params)
+        }
+        statuses = {
+            app_id: (total, idle)
+            for app_id, total, idle
+            in conn.execute(SQL_STATUS_BY_APPLICATION, params)
+        }
+        latest_status = dict(conn.execute(SQL_LATEST_STATUS_BY_APPLICATION))
 
-    cursor.execute(
-        """
-        SELECT application_id
-        FROM applications
-        """
-    )
+    rows = []
 
-    application_ids = [row[0] for row in cursor.fetchall()]
-    conn.close()
+    for app_id, created_idle in created:
+        outreach_total, follow_ups, outreach_idle = outreach.get(app_id, (0, 0, None))
+        status_total, status_idle = statuses.get(app_id, (0, None))
+        action_total = outreach_total + status_total
 
-    rows = []
+        idle = [d for d in (created_idle, outreach_idle, status_idle) if d is not None]
 
-    for app_id in application_ids:
         row = {
             "application_id": app_id,
-            "current_status": current_status(app_id),
-            "days_since_last_action": days_since_last_action(app_id),
-            "total_outreach_count": total_outreach_count(app_id),
-            "follow_up_count": follow_up_count(app_id),
-            "has_follow_up": has_follow_up(app_id),
-            "total_action_count": total_action_count(app_id),
-            "effort_score_raw": effort_score_raw(app_id),
+            "current_status": latest_status.get(app_id),
+            "days_since_last_action": int(min(idle)) if idle else None,
+            "total_outreach_count": outreach_total,
+            "follow_up_count": follow_ups,
+            "has_follow_up": follow_ups >= 1,
+            "total_action_count": action_total,
+            # v1.1 definition: effort_score_raw == total_action_count
+            "effort_score_raw": action_total,
         }
         rows.append(row)
 
@@ -184,6 +193,7 @@ def application_metrics_view():
 # Test harness
 # -------------------------
 
+# Run from the repo root: python3 -m scripts.metrics_application
 if __name__ == "__main__":
     print("Running application metrics view...\n")
 
@@ -0,0 +1,39 @@
+import sqlite3
+from pathlib import Path
+
+DB_PATH = Path(__file__).resolve().parents[2] / "data" / "asa.db"
+
+def run():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    # Per-application lookups filter on application_id and read MAX(timestamp)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_outreach_events_app_ts
+        ON outreach_events (application_id, timestamp);
+    """)
+
+    # Covers follow-up counts (application_id + outreach_type) without table reads
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_outreach_events_app_type
+        ON outreach_events (application_id, outreach_type);
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_response_events_app_ts
+        ON response_events (application_id, timestamp);
+    """)
+
+    # Latest-status lookups read status straight from the index;
+    # status_id breaks ties between changes logged in the same second
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_status_history_app_ts_id_status
+        ON status_history (application_id, timestamp DESC, status_id DESC, status);
+    """)
+
+    conn.commit()
+    conn.close()
+    print("Event indexes ready.")
+
+if __name__ == "__main__":
+    run()
@@ -1,4 +1,8 @@
+import atexit
 import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -29,8 +33,79 @@ INACTIVITY_RATE_THRESHOLD = 0.5
 # Database connection
 # ==================================================
 
+# Applied to every new connection. journal_mode persists in the
+# database file; the rest are per-connection (256 MB mmap, 64 MB cache).
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -65536",
+)
+
+
+class _ThreadConnection:
+    """
+    Owns one thread's connection. Held only in that thread's local
+    storage, so it is released, and the connection closed, on the
+    owning thread when the thread exits.
+    """
+    __slots__ = ("conn",)
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __del__(self):
+        self.conn.close()
+
+
+_local = threading.local()
+
 def get_connection():
-    return sqlite3.connect(DB_PATH)
+    """
+    Returns this thread's long-lived connection.
+    Opened lazily on first use and closed when the thread exits;
+    the main thread's connection is closed at interpreter exit.
+    Callers must not close it; use close_connection() instead.
+    """
+    owner = getattr(_local, "owner", None)
+
+    if owner is None:
+        conn = sqlite3.connect(DB_PATH)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        owner = _local.owner = _ThreadConnection(conn)
+
+    return owner.conn
+
+
+def close_connection():
+    """
+    Closes this thread's connection, if one is open.
+    The next get_connection() call on this thread opens a new one.
+    """
+    _local.owner = None
+
+
+atexit.register(close_connection)
+
+
+@contextmanager
+def read_transaction(conn):
+    """
+    Groups several reads into one deferred transaction so they
+    share a single snapshot and lock acquisition.
+    Joins the caller's transaction if one is already open.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+
+    conn.execute("BEGIN DEFERRED")
+    try:
+        yield conn
+    finally:
+        conn.execute("COMMIT")
 
 # ==================================================
 # Time utilities (single source of truth)
@@ -39,11 +114,6 @@ def get_connection():
 def _utcnow():
     return datetime.now(timezone.utc)
 
-def _parse_ts(ts):
-    if ts is None:
-        return None
-    return datetime.fromisoformat(ts).replace(tzinfo=timezone.utc)
-
 # ==================================================
 # Pillar A — Core Write Functions
 # ==================================================
@@ -63,9 +133,6 @@ def add_application(
     conn = get_connection()
     cursor = conn.cursor()
 
-    if submitted_at is None:
-        submitted_at = _utcnow().isoformat()
-
     cursor.execute(
         """
         INSERT INTO applications (
@@ -74,7 +141,7 @@ def add_application(
             application_link,
             created_at
         )
-        VALUES (?, ?, ?, ?)
+        VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
         """,
         (
             company,
@@ -86,7 +153,6 @@ def add_application(
 
     conn.commit()
     application_id = cursor.lastrowid
-    conn.close()
 
     return application_id
 
@@ -109,7 +175,48 @@ def add_outreach(application_id, channel, outreach_type="initial"):
     )
 
     conn.commit()
-    conn.close()
+
+
+def add_applications(rows):
+    """
+    Bulk version of add_application.
+    rows: iterable of (company, role, application_link, submitted_at);
+    a None submitted_at defaults to the current UTC time.
+    All rows are inserted in one transaction.
+    """
+    conn = get_connection()
+
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO applications (
+                company,
+                role,
+                application_link,
+                created_at
+            )
+            VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            """,
+            rows,
+        )
+
+
+def add_outreach_events(rows):
+    """
+    Bulk version of add_outreach.
+    rows: iterable of (application_id, channel, outreach_type).
+    All rows are inserted in one transaction.
+    """
+    conn = get_connection()
+
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO outreach_events (application_id, channel, outreach_type)
+            VALUES (?, ?, ?)
+            """,
+            rows,
+        )
 
 
 def add_response(application_id, channel, response_type):
@@ -132,7 +239,6 @@ def add_response(application_id, channel, response_type):
     )
 
     conn.commit()
-    conn.close()
 
 def add_customization(
     application_id,
@@ -152,18 +258,16 @@ def add_customization(
         """
         INSERT OR REPLACE INTO application_customization
         (application_id, resume_customized, cover_letter_customized, timestamp)
-        VALUES (?, ?, ?, ?)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
         """,
         (
             application_id,
             int(resume_customized),
             int(cover_letter_customized),
-            _utcnow().isoformat(),
         ),
     )
 
     conn.commit()
-    conn.close()
 
 # ==================================================
 # Pillar B — Canonical Metrics & Time Awareness
@@ -181,59 +285,83 @@ STABLE_RESPONSE_COUNT_THRESHOLD = 3
 
 
 # ----------------------
-# B.1 — Time Core
+# B.0.1 — Query Templates
 # ----------------------
+# Defined once so every call passes the identical string and
+# reuses the connection's cached prepared statement.
+
+SQL_DAYS_SINCE_LAST_ACTION = """
+    SELECT CAST(
+        julianday(?2) - NULLIF(MAX(
+            COALESCE(julianday((SELECT created_at FROM applications WHERE application_id = ?1)), 0),
+            COALESCE(julianday((SELECT MAX(timestamp) FROM outreach_events WHERE application_id = ?1)), 0),
+            COALESCE(julianday((SELECT MAX(timestamp) FROM response_events WHERE application_id = ?1)), 0),
+            COALESCE(julianday((SELECT MAX(timestamp) FROM status_history WHERE application_id = ?1)), 0)
+        ), 0)
+    AS INTEGER)
+"""
+
+SQL_TOTAL_OUTREACH = "SELECT COUNT(*) FROM outreach_events WHERE application_id = ?"
+
+SQL_FOLLOW_UP_COUNT = """
+    SELECT COUNT(*)
+    FROM outreach_events
+    WHERE application_id = ?
+      AND outreach_type = 'follow_up'
+"""
+
+SQL_HAS_FOLLOW_UP = """
+    SELECT EXISTS (
+        SELECT 1
+        FROM outreach_events
+        WHERE application_id = ?
+          AND outreach_type = 'follow_up'
+    )
+"""
 
-def _latest_timestamp(application_id):
-    """
-    Returns the most recent timestamp across all events
-    for a given application_id.
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT MAX(ts) FROM (
-            SELECT created_at AS ts
-            FROM applications
-            WHERE application_id = ?
-
-            UNION ALL
+SQL_RESPONSE_COUNT = "SELECT COUNT(*) FROM response_events WHERE application_id = ?"
 
-            SELECT created_at AS ts
-            FROM outreach_events
-            WHERE application_id = ?
+SQL_STATUS_CHANGE_COUNT = "SELECT COUNT(*) FROM status_history WHERE application_id = ?"
 
-            UNION ALL
+SQL_CUSTOMIZATION_FLAGS = """
+    SELECT resume_customized, cover_letter_customized
+    FROM application_customization
+    WHERE application_id = ?
+"""
 
-            SELECT timestamp AS ts
-            FROM response_events
-            WHERE application_id = ?
+SQL_CURRENT_STATUS = """
+    SELECT status
+    FROM status_history
+    WHERE application_id = ?
+    ORDER BY timestamp DESC, status_id DESC
+    LIMIT 1
+"""
 
-            UNION ALL
+SQL_APPLICATION_BASE = """
+    SELECT company, role, application_link
+    FROM applications
+    WHERE application_id = ?
+"""
 
-            SELECT created_at AS ts
-            FROM status_history
-            WHERE application_id = ?
-        )
-        """,
-        (application_id, application_id, application_id, application_id),
-    )
-
-    row = cursor.fetchone()
-    conn.close()
-
-    return row[0]
 
+# ----------------------
+# B.1 — Time Core
+# ----------------------
 
-def days_since_last_action(application_id):
-    ts = _latest_timestamp(application_id)
-    if ts is None:
-        return None
+def days_since_last_action(application_id, now=None):
+    """
+    Whole days since the most recent event of any kind
+    for a given application_id. None if there are none.
+    now: reference time; pass one value when looping.
+    """
+    if now is None:
+        now = _utcnow()
 
-    last = datetime.fromisoformat(ts).replace(tzinfo=timezone.utc)
-    return (datetime.now(timezone.utc) - last).days
+    conn = get_connection()
+    return conn.execute(
+        SQL_DAYS_SINCE_LAST_ACTION,
+        (application_id, now.isoformat()),
+    ).fetchone()[0]
 
 # ----------------------
 # B.2 — Application-Level Counts
@@ -241,79 +369,26 @@ def days_since_last_action(application_id):
 
 def total_outreach_count(application_id):
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        "SELECT COUNT(*) FROM outreach_events WHERE application_id = ?",
-        (application_id,),
-    )
-
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    return conn.execute(SQL_TOTAL_OUTREACH, (application_id,)).fetchone()[0]
 
 
 def follow_up_count(application_id):
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT COUNT(*)
-        FROM outreach_events
-        WHERE application_id = ?
-          AND outreach_type = 'follow_up'
-        """,
-        (application_id,),
-    )
-
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    return conn.execute(SQL_FOLLOW_UP_COUNT, (application_id,)).fetchone()[0]
 
 
 def response_count(application_id):
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        "SELECT COUNT(*) FROM response_events WHERE application_id = ?",
-        (application_id,),
-    )
-
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    return conn.execute(SQL_RESPONSE_COUNT, (application_id,)).fetchone()[0]
 
 
 def status_change_count(application_id):
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        "SELECT COUNT(*) FROM status_history WHERE application_id = ?",
-        (application_id,),
-    )
-
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    return conn.execute(SQL_STATUS_CHANGE_COUNT, (application_id,)).fetchone()[0]
 
 def customization_flags(application_id):
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT resume_customized, cover_letter_customized
-        FROM application_customization
-        WHERE application_id = ?
-        """,
-        (application_id,),
-    )
-
-    row = cursor.fetchone()
-    conn.close()
+    row = conn.execute(SQL_CUSTOMIZATION_FLAGS, (application_id,)).fetchone()
 
     if row is None:
         return {
@@ -335,7 +410,9 @@ def customization_flags(application_id):
 # ----------------------
 
 def has_follow_up(application_id):
-    return follow_up_count(application_id) > 0
+    # EXISTS stops at the first matching row instead of counting them all
+    conn = get_connection()
+    return bool(conn.execute(SQL_HAS_FOLLOW_UP, (application_id,)).fetchone()[0])
 
 
 def has_response(application_id):
@@ -364,21 +441,7 @@ def effort_score_raw(application_id):
 
 def current_status(application_id):
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT status
-        FROM status_history
-        WHERE application_id = ?
-        ORDER BY created_at DESC
-        LIMIT 1
-        """,
-        (application_id,),
-    )
-
-    row = cursor.fetchone()
-    conn.close()
+    row = conn.execute(SQL_CURRENT_STATUS, (application_id,)).fetchone()
 
     return row[0] if row else "open"
 
@@ -386,78 +449,193 @@ def current_status(application_id):
 # B.5 — Application Metrics View (Canonical)
 # ----------------------
 
-def application_metrics_view():
-    conn = get_connection()
-    cursor = conn.cursor()
+SQL_APPLICATION_METRICS_CTE = """
+    WITH outreach AS (
+        SELECT
+            application_id,
+            COUNT(*) AS outreach_total,
+            SUM(CASE WHEN outreach_type = 'follow_up' THEN 1 ELSE 0 END) AS follow_ups,
+            MAX(timestamp) AS last_ts
+        FROM outreach_events
+        GROUP BY application_id
+    ),
+    responses AS (
+        SELECT application_id, COUNT(*) AS response_total, MAX(timestamp) AS last_ts
+        FROM response_events
+        GROUP BY application_id
+    ),
+    statuses AS (
+        SELECT application_id, COUNT(*) AS status_total, MAX(timestamp) AS last_ts
+        FROM status_history
+        GROUP BY application_id
+    ),
+    latest_status AS (
+        SELECT application_id, status
+        FROM (
+            SELECT
+                application_id,
+                status,
+                ROW_NUMBER() OVER (
+                    PARTITION BY application_id
+                    ORDER BY timestamp DESC, status_id DESC
+                ) AS rn
+            FROM status_history
+        )
+        WHERE rn = 1
+    ),
+    metrics AS (
+        SELECT
+            a.application_id,
+            COALESCE(ls.status, 'open') AS current_status,
+            CAST(
+                julianday(:now) - NULLIF(MAX(
+                    COALESCE(julianday(a.created_at), 0),
+                    COALESCE(julianday(o.last_ts), 0),
+                    COALESCE(julianday(r.last_ts), 0),
+                    COALESCE(julianday(s.last_ts), 0)
+                ), 0)
+            AS INTEGER) AS days_since_last_action,
+            COALESCE(o.outreach_total, 0) AS total_outreach_count,
+            COALESCE(o.follow_ups, 0) AS follow_up_count,
+            COALESCE(r.response_total, 0) AS response_count,
+            COALESCE(o.outreach_total, 0)
+                + COALESCE(r.response_total, 0)
+                + COALESCE(s.status_total, 0) AS total_action_count,
+            COALESCE(c.resume_customized, 0) AS resume_customized,
+            COALESCE(c.cover_letter_customized, 0) AS cover_letter_customized
+        FROM applications a
+        LEFT JOIN outreach o ON o.application_id = a.application_id
+        LEFT JOIN responses r ON r.application_id = a.application_id
+        LEFT JOIN statuses s ON s.application_id = a.application_id
+        LEFT JOIN latest_status ls ON ls.application_id = a.application_id
+        LEFT JOIN application_customization c ON c.application_id = a.application_id
+    )
+"""
 
-    cursor.execute("SELECT application_id FROM applications")
-    application_ids = [r[0] for r in cursor.fetchall()]
-    conn.close()
-
-    rows = []
-
-    for app_id in application_ids:
-        customization = customization_flags(app_id)
-
-        days_idle = days_since_last_action(app_id)
-        outreach_total = total_outreach_count(app_id)
-        follow_ups = follow_up_count(app_id)
-
-        rows.append({
-            "application_id": app_id,
-            "current_status": current_status(app_id),
-            "days_since_last_action": days_idle,
-            "total_outreach_count": outreach_total,
-            "follow_up_count": follow_ups,
-            "has_follow_up": follow_ups > 0,
-            "responded_flag": has_response(app_id),
-            "total_action_count": total_action_count(app_id),
-            "effort_score_raw": effort_score_raw(app_id),
-            "has_zero_outreach": outreach_total == 0,
-            "has_no_follow_up": outreach_total > 0 and follow_ups == 0,
-            "is_idle_application": (
-                days_idle is not None and days_idle > IDLE_DAYS_THRESHOLD
-            ),
-            "resume_customized": customization["resume_customized"],
-            "cover_letter_customized": customization["cover_letter_customized"],
-            "any_customization": customization["any_customization"],
-        })
+SQL_APPLICATION_METRICS = SQL_APPLICATION_METRICS_CTE + """
+    SELECT * FROM metrics
+    ORDER BY application_id
+"""
 
-    return rows
 
-# ----------------------
-# B.6 — Channel Metrics View (Canonical)
-# ----------------------
+@dataclass(slots=True)
+class MetricsRow:
+    """
+    Canonical per-application metrics row.
+    application_state is filled in by application_state_view().
+    """
+    application_id: int
+    current_status: str
+    days_since_last_action: int | None
+    total_outreach_count: int
+    follow_up_count: int
+    has_follow_up: bool
+    responded_flag: bool
+    total_action_count: int
+    effort_score_raw: int
+    has_zero_outreach: bool
+    has_no_follow_up: bool
+    is_idle_application: bool
+    resume_customized: bool
+    cover_letter_customized: bool
+    any_customization: bool
+    application_state: str | None = None
+
+
+def _metrics_row(record, application_state=None):
+    """
+    Expands one metrics CTE record into the canonical row,
+    deriving the boolean flags from the raw counts.
+    """
+    (
+        app_id,
+        status,
+        days_idle,
+        outreach_total,
+        follow_ups,
+        responses_total,
+        action_total,
+        resume,
+        cover_letter,
+    ) = record
+
+    return MetricsRow(
+        application_id=app_id,
+        current_status=status,
+        days_since_last_action=days_idle,
+        total_outreach_count=outreach_total,
+        follow_up_count=follow_ups,
+        has_follow_up=follow_ups > 0,
+        responded_flag=responses_total > 0,
+        total_action_count=action_total,
+        effort_score_raw=action_total,
+        has_zero_outreach=outreach_total == 0,
+        has_no_follow_up=outreach_total > 0 and follow_ups == 0,
+        is_idle_application=(
+            days_idle is not None and days_idle > IDLE_DAYS_THRESHOLD
+        ),
+        resume_customized=bool(resume),
+        cover_letter_customized=bool(cover_letter),
+        any_customization=bool(resume or cover_letter),
+        application_state=application_state,
+    )
 
-def channel_metrics_view():
+
+def application_metrics_view():
+    """
+    One row per application.
+    All aggregates come from a single CTE query
+    rather than per-application helper calls.
+    Every row measures idle days against the same instant.
+    """
     conn = get_connection()
-    cursor = conn.cursor()
+    cursor = conn.execute(
+        SQL_APPLICATION_METRICS,
+        {"now": _utcnow().isoformat()},
+    )
 
-    cursor.execute("SELECT DISTINCT channel FROM outreach_events")
-    channels = [r[0] for r in cursor.fetchall()]
+    return [_metrics_row(r) for r in cursor]
 
-    rows = []
+# ----------------------
+# B.6 — Channel Metrics View (Canonical)
+# ----------------------
 
-    for channel in channels:
-        cursor.execute(
-            "SELECT COUNT(*) FROM outreach_events WHERE channel = ?",
-            (channel,),
-        )
-        outreach_count = cursor.fetchone()[0]
+SQL_CHANNEL_METRICS = """
+    WITH outreach AS (
+        SELECT
+            channel,
+            COUNT(*) AS outreach_count,
+            COUNT(DISTINCT application_id) AS app_coverage,
+            MIN(outreach_id) AS first_outreach_id
+        FROM outreach_events
+        GROUP BY channel
+    ),
+    responses AS (
+        SELECT channel, COUNT(*) AS response_count
+        FROM response_events
+        GROUP BY channel
+    )
+    SELECT
+        o.channel,
+        o.outreach_count,
+        o.app_coverage,
+        COALESCE(r.response_count, 0)
+    FROM outreach o
+    LEFT JOIN responses r ON r.channel = o.channel
+    ORDER BY o.first_outreach_id
+"""
 
-        cursor.execute(
-            "SELECT COUNT(DISTINCT application_id) FROM outreach_events WHERE channel = ?",
-            (channel,),
-        )
-        app_coverage = cursor.fetchone()[0]
 
-        cursor.execute(
-            "SELECT COUNT(*) FROM response_events WHERE channel = ?",
-            (channel,),
-        )
-        responses = cursor.fetchone()[0]
+def channel_metrics_view():
+    """
+    One row per outreach channel, from a single grouped query.
+    Channels keep first-seen order.
+    """
+    conn = get_connection()
+    cursor = conn.execute(SQL_CHANNEL_METRICS)
 
-        rows.append({
+    return [
+        {
             "channel_name": channel,
             "outreach_count_by_channel": outreach_count,
             "application_coverage_by_channel": app_coverage,
@@ -466,18 +644,58 @@ def channel_metrics_view():
                 responses / app_coverage if app_coverage > 0 else None
             ),
             "is_low_sample_channel": outreach_count < MIN_CHANNEL_SAMPLE_SIZE,
-        })
-
-    conn.close()
-    return rows
+        }
+        for channel, outreach_count, app_coverage, responses in cursor
+    ]
 
 # ==================================================
 # Pillar B — Portfolio Metrics View
 # ==================================================
 
-def portfolio_metrics_view():
-    app_rows = application_metrics_view()
-    applications_total = len(app_rows)
+SQL_PORTFOLIO_DAYS_ACTIVE = """
+    SELECT CAST(MAX(julianday(created_at)) - MIN(julianday(created_at)) AS INTEGER)
+    FROM applications
+"""
+
+
+SQL_PORTFOLIO_METRICS = SQL_APPLICATION_METRICS_CTE + """
+    SELECT
+        COUNT(*),
+        SUM(CASE WHEN follow_up_count > 0 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN total_outreach_count = 0 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN days_since_last_action > :idle_days THEN 1 ELSE 0 END),
+        (""" + SQL_PORTFOLIO_DAYS_ACTIVE + """)
+    FROM metrics
+"""
+
+
+def portfolio_metrics_view(app_rows=None):
+    """
+    Portfolio-wide rates, aggregated in one query over the
+    application metrics CTE. The created_at span is measured
+    in SQL as whole days.
+    app_rows: metrics rows the caller already holds; when given,
+    counts come from them instead of re-running the CTE.
+    """
+    conn = get_connection()
+
+    if app_rows is None:
+        (
+            applications_total,
+            follow_up_total,
+            zero_outreach_total,
+            idle_total,
+            days_active,
+        ) = conn.execute(
+            SQL_PORTFOLIO_METRICS,
+            {"now": _utcnow().isoformat(), "idle_days": IDLE_DAYS_THRESHOLD},
+        ).fetchone()
+    else:
+        applications_total = len(app_rows)
+        follow_up_total = sum(1 for r in app_rows if r.has_follow_up)
+        zero_outreach_total = sum(1 for r in app_rows if r.has_zero_outreach)
+        idle_total = sum(1 for r in app_rows if r.is_idle_application)
+        days_active = conn.execute(SQL_PORTFOLIO_DAYS_ACTIVE).fetchone()[0]
 
     if applications_total == 0:
         return {
@@ -490,32 +708,18 @@ def portfolio_metrics_view():
             "low_follow_up_portfolio": None,
         }
 
-    follow_up_rate = sum(1 for r in app_rows if r["has_follow_up"]) / applications_total
-    zero_outreach_rate = sum(
-        1 for r in app_rows if r["total_outreach_count"] == 0
-    ) / applications_total
-    idle_application_rate = sum(
-        1 for r in app_rows if r["is_idle_application"]
-    ) / applications_total
+    follow_up_rate = follow_up_total / applications_total
+    zero_outreach_rate = zero_outreach_total / applications_total
+    idle_application_rate = idle_total / applications_total
 
     high_idle_portfolio = idle_application_rate > HIGH_IDLE_RATE_THRESHOLD
     low_follow_up_portfolio = follow_up_rate < LOW_FOLLOW_UP_RATE_THRESHOLD
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT MIN(created_at), MAX(created_at) FROM applications")
-    min_ts, max_ts = cursor.fetchone()
-    conn.close()
-
     applications_per_week = None
 
-    if min_ts and max_ts:
-        start = _parse_ts(min_ts)
-        end = _parse_ts(max_ts)
-
-        if start and end:
-            weeks_active = max(1, ((end - start).days + 6) // 7)
-            applications_per_week = applications_total / weeks_active
+    if days_active is not None:
+        weeks_active = max(1, (days_active + 6) // 7)
+        applications_per_week = applications_total / weeks_active
 
     return {
         "applications_total": applications_total,
@@ -531,31 +735,34 @@ def portfolio_metrics_view():
 # Pillar C.1 — Application State
 # ==================================================
 
-def application_state(metrics_row):
-    """
-    Determines the canonical state of an application.
-    Exactly one state per application.
-    """
-
-    if metrics_row["current_status"] == "closed":
-        return "closed"
-
-    if metrics_row["total_outreach_count"] == 0:
-        return "unengaged"
-
-    days_idle = metrics_row.get("days_since_last_action")
-
-    if days_idle is not None and days_idle > IDLE_DAYS_THRESHOLD:
-        return "engaged_idle"
-
-    return "active"
+# The canonical state rules; exactly one state per application.
+SQL_APPLICATION_STATES = SQL_APPLICATION_METRICS_CTE + """
+    SELECT
+        metrics.*,
+        CASE
+            WHEN current_status = 'closed' THEN 'closed'
+            WHEN total_outreach_count = 0 THEN 'unengaged'
+            WHEN days_since_last_action > :idle_days THEN 'engaged_idle'
+            ELSE 'active'
+        END AS application_state
+    FROM metrics
+    ORDER BY application_id
+"""
 
 
 def application_state_view():
-    rows = application_metrics_view()
-    for r in rows:
-        r["application_state"] = application_state(r)
-    return rows
+    """
+    Metrics rows with their application_state attached.
+    Classification runs in SQL_APPLICATION_STATES, the only
+    place the state rules are defined.
+    """
+    conn = get_connection()
+    cursor = conn.execute(
+        SQL_APPLICATION_STATES,
+        {"now": _utcnow().isoformat(), "idle_days": IDLE_DAYS_THRESHOLD},
+    )
+
+    return [_metrics_row(r[:-1], application_state=r[-1]) for r in cursor]
 
 # ==================================================
 # Pillar C.2 — Channel Signal State
@@ -634,12 +841,13 @@ def portfolio_pattern(portfolio_row):
     return "unstructured_bursting"
 
 
-def portfolio_pattern_view():
+def portfolio_pattern_view(app_rows=None):
     """
     Attaches portfolio pattern and structural flags.
+    app_rows: optional precomputed metrics rows, see portfolio_metrics_view.
     """
 
-    row = portfolio_metrics_view()
+    row = portfolio_metrics_view(app_rows)
     row["portfolio_pattern"] = portfolio_pattern(row)
 
     channel_rows = channel_signal_state_view()
@@ -759,22 +967,20 @@ def describe_application(
 # D.1.4 — Public Interface
 # --------------------------------------------------
 
-def application_narratives_view():
+def application_narratives_view(state_rows=None):
     """
     Returns application_id → list of narrative sentences
+    state_rows: optional precomputed application_state_view() rows
     """
-    rows = application_state_view()
+    rows = state_rows if state_rows is not None else application_state_view()
 
     narratives = {}
 
     for r in rows:
-        application_id = r["application_id"]
-        application_state = r["application_state"]
-        flags = r.get("flags", {})
-
-        narratives[application_id] = _assemble_application_narrative(
-            application_state,
-            flags,
+        # Rows carry no narrative flags; base sentence only
+        narratives[r.application_id] = _assemble_application_narrative(
+            r.application_state,
+            {},
         )
 
     return narratives
@@ -979,19 +1185,7 @@ def get_application_base(application_id):
     Returns base application identity data.
     """
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT company, role, application_link
-        FROM applications
-        WHERE application_id = ?
-        """,
-        (application_id,),
-    )
-
-    row = cur.fetchone()
-    conn.close()
+    row = conn.execute(SQL_APPLICATION_BASE, (application_id,)).fetchone()
 
     if not row:
         return None
@@ -1012,18 +1206,12 @@ def get_application_snapshot(application_id):
     # --- base identity ---
     base = get_application_base(application_id)
 
-    # --- analytics views ---
-    metrics_rows = application_metrics_view()
+    # --- analytics views (state rows carry the metrics too) ---
     state_rows = application_state_view()
-    narratives = application_narratives_view()
+    narratives = application_narratives_view(state_rows)
 
     metrics = {
-        r["application_id"]: r
-        for r in metrics_rows
-    }
-
-    states = {
-        r["application_id"]: r["application_state"]
+        r.application_id: r
         for r in state_rows
     }
 
@@ -1033,8 +1221,8 @@ def get_application_snapshot(application_id):
     return {
         "application_id": application_id,
         "base": base,
-        "state": states.get(application_id),
-        "metrics": metrics.get(application_id),
+        "state": metrics[application_id].application_state,
+        "metrics": metrics[application_id],
         "narratives": narratives.get(application_id, []),
     }
 
@@ -1061,7 +1249,7 @@ def _filter_active_applications(application_rows):
     """
     Closed applications may not surface alongside active ones.
     """
-    active = [r for r in application_rows if r.get("application_state") != "closed"]
+    active = [r for r in application_rows if r.application_state != "closed"]
     return active if active else application_rows
 
 
@@ -1105,14 +1293,14 @@ def assemble_insight_bundle(
 
     for r in filtered_apps[:MAX_APPLICATIONS_DISPLAYED]:
         narrative = describe_application(
-            application_state=r.get("application_state"),
-            no_follow_up_flag=r.get("has_no_follow_up", False),
-            responded_flag=r.get("responded_flag", False),
+            application_state=r.application_state,
+            no_follow_up_flag=r.has_no_follow_up,
+            responded_flag=r.responded_flag,
         )
 
         if narrative:
             bundle["applications"].append({
-                "application_id": r.get("application_id"),
+                "application_id": r.application_id,
                 "sentences": narrative[:MAX_APPLICATION_SENTENCES],
             })
 
@@ -1140,18 +1328,18 @@ if __name__ == "__main__":
     print("APPLICATION METRICS (Pillar B)")
     print("==============================")
 
-    app_metrics = application_metrics_view()
-    for r in app_metrics:
+    # State rows carry every metric, so one query serves both sections
+    app_states = application_state_view()
+    for r in app_states:
         print(r)
 
     print("\n==============================")
     print("APPLICATION STATES (Pillar C)")
     print("==============================")
 
-    app_states = application_state_view()
     for r in app_states:
         print(
-            f"Application {r['application_id']}: {r['application_state']}"
+            f"Application {r.application_id}: {r.application_state}"
         )
 
     print("\n==============================")
@@ -1160,12 +1348,12 @@ if __name__ == "__main__":
 
     for r in app_states:
         narrative = describe_application(
-            application_state=r["application_state"],
-            no_follow_up_flag=r.get("has_no_follow_up", False),
-            responded_flag=r.get("responded_flag", False),
+            application_state=r.application_state,
+            no_follow_up_flag=r.has_no_follow_up,
+            responded_flag=r.responded_flag,
         )
 
-        print(f"\nApplication {r['application_id']}:")
+        print(f"\nApplication {r.application_id}:")
         for s in narrative:
             print("  -", s)
 
@@ -1203,14 +1391,14 @@ if __name__ == "__main__":
     print("PORTFOLIO METRICS (Pillar B)")
     print("==============================")
 
-    portfolio_metrics = portfolio_metrics_view()
+    portfolio_metrics = portfolio_metrics_view(app_states)
     print(portfolio_metrics)
 
     print("\n==============================")
     print("PORTFOLIO PATTERN (Pillar C.3)")
     print("==============================")
 
-    portfolio_row = portfolio_pattern_view()
+    portfolio_row = portfolio_pattern_view(app_states)
     print(
         portfolio_row.get("portfolio_pattern"),
         {
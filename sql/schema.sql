@@ -26,5 +26,12 @@ CREATE TABLE IF NOT EXISTS outreach_events (
     FOREIGN KEY (application_id) REFERENCES applications(application_id)
 );
 
+-- Per-application event lookups
+CREATE INDEX IF NOT EXISTS idx_outreach_events_app_ts
+    ON outreach_events (application_id, timestamp);
 
+CREATE INDEX IF NOT EXISTS idx_outreach_events_app_type
+    ON outreach_events (application_id, outreach_type);
 
+CREATE INDEX IF NOT EXISTS idx_status_history_app_ts_id_status
+    ON status_history (application_id, timestamp DESC, status_id DESC, status);